@@ -3,17 +3,71 @@
 Debug script to help troubleshoot MCP server issues in Cursor
 """
 
+import argparse
+import logging
+import os
+import shutil
 import sys
 import json
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-print("🔍 MCP Server Debug Tool for Cursor")
-print("=" * 50)
+try:
+    import orjson
+except ImportError:  # optional, fall back to the stdlib encoder
+    orjson = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+SRC_DIR = PROJECT_ROOT / "src"
+MAIN_SCRIPT = PROJECT_ROOT / "main.py"
+BANNER_RULE = "=" * 50
+
+# Tracebacks are only rendered when LOG_LEVEL=DEBUG
+logger = logging.getLogger("debug_mcp_cursor")
+logger.addHandler(logging.StreamHandler())
+# The server import configures the root logger; don't print records twice
+logger.propagate = False
+logger.setLevel(getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO))
+
+
+@lru_cache(maxsize=None)
+def run_command(cmd):
+    """Run a command once and cache its completed process."""
+    return subprocess.run(list(cmd), capture_output=True, text=True, cwd=PROJECT_ROOT)
+
+
+def dumps_pretty(data):
+    """Serialize data as indented JSON for display."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def dumps_wire(data):
+    """Serialize data as compact JSON for protocol messages."""
+    return json.dumps(data, separators=(",", ":"))
+
+
+def print_json_block(data):
+    """Print a fenced JSON block with a single write."""
+    print(f"```json\n{dumps_pretty(data)}\n```")
+
+
+parser = argparse.ArgumentParser(description="Troubleshoot the OSM Edit MCP server setup for Cursor")
+parser.add_argument(
+    "--verify-subprocess",
+    action="store_true",
+    help="also check that the server initializes in a fresh `uv run` interpreter",
+)
+args = parser.parse_args()
+
+print(f"🔍 MCP Server Debug Tool for Cursor\n{BANNER_RULE}")
 
 # 1. Check if the server can be imported
 print("\n1️⃣ Checking if server can be imported...")
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+sys.path.insert(0, str(SRC_DIR))
 try:
     from osm_edit_mcp.server import mcp
     print("✅ Server imported successfully")
@@ -21,15 +75,36 @@ try:
     # FastMCP doesn't expose tools directly, but we know they exist
     print("   Tools are registered with FastMCP")
 except Exception as e:
-    print(f"❌ Failed to import server: {e}")
-    import traceback
-    traceback.print_exc()
+    print(f"❌ Failed to import server: {e!r}")
+    logger.debug("Server import traceback", exc_info=True)
+    if not logger.isEnabledFor(logging.DEBUG):
+        print("   Re-run with LOG_LEVEL=DEBUG for the full traceback")
     sys.exit(1)
 
+# The subprocess probes below are independent, so start them all now
+# and report the results in order as they are needed
+test_script = '''
+import sys
+sys.path.insert(0, "src")
+from osm_edit_mcp.server import mcp
+print(f"Server: {mcp.name}")
+print("Tools registered")
+'''
+UV_VERSION = ("uv", "--version")
+UV_PYTHON_VERSION = ("uv", "run", "python", "--version")
+UV_SERVER_INIT = ("uv", "run", "python", "-c", test_script)
+
+probe_pool = ThreadPoolExecutor(max_workers=3)
+probe_cmds = [UV_VERSION, UV_PYTHON_VERSION]
+if args.verify_subprocess:
+    probe_cmds.append(UV_SERVER_INIT)
+probes = {cmd: probe_pool.submit(run_command, cmd) for cmd in probe_cmds}
+probe_pool.shutdown(wait=False)
+
 # 2. Check if uv is available
 print("\n2️⃣ Checking if uv is available...")
 try:
-    result = subprocess.run(["uv", "--version"], capture_output=True, text=True)
+    result = probes[UV_VERSION].result()
     if result.returncode == 0:
         print(f"✅ uv is installed: {result.stdout.strip()}")
     else:
@@ -41,9 +116,7 @@ except FileNotFoundError:
 # 3. Check Python path
 print("\n3️⃣ Checking Python environment...")
 try:
-    result = subprocess.run(["uv", "run", "python", "--version"], 
-                          capture_output=True, text=True, 
-                          cwd=Path(__file__).parent)
+    result = probes[UV_PYTHON_VERSION].result()
     if result.returncode == 0:
         print(f"✅ Python via uv: {result.stdout.strip()}")
     else:
@@ -53,46 +126,38 @@ except Exception as e:
 
 # 4. Test MCP server initialization
 print("\n4️⃣ Testing MCP server initialization...")
-test_script = '''
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-from osm_edit_mcp.server import mcp
-print(f"Server: {mcp.name}")
-print("Tools registered")
-'''
-
-try:
-    result = subprocess.run(
-        ["uv", "run", "python", "-c", test_script],
-        capture_output=True, text=True,
-        cwd=Path(__file__).parent
-    )
-    if result.returncode == 0:
-        print("✅ Server initializes correctly via uv")
-        print(f"   {result.stdout.strip()}")
-    else:
-        print("❌ Server initialization failed")
-        print(f"   Error: {result.stderr}")
-except Exception as e:
-    print(f"❌ Failed to test initialization: {e}")
+if args.verify_subprocess:
+    try:
+        result = probes[UV_SERVER_INIT].result()
+        if result.returncode == 0:
+            print("✅ Server initializes correctly via uv")
+            print(f"   {result.stdout.strip()}")
+        else:
+            print("❌ Server initialization failed")
+            print(f"   Error: {result.stderr}")
+    except Exception as e:
+        print(f"❌ Failed to test initialization: {e}")
+else:
+    # The server module was already imported in step 1
+    print("✅ Server initializes correctly in this interpreter")
+    print(f"   Server: {mcp.name}")
+    print("   Tools registered")
+    print("   (use --verify-subprocess to also check a fresh `uv run` interpreter)")
 
 # 5. Generate correct Cursor configuration
 print("\n5️⃣ Correct Cursor Configuration:")
 cursor_config = {
     "osm-edit": {
         "command": "uv",
-        "args": ["run", "python", str(Path(__file__).parent / "main.py")],
-        "cwd": str(Path(__file__).parent),
+        "args": ["run", "python", str(MAIN_SCRIPT)],
+        "cwd": str(PROJECT_ROOT),
         "env": {
-            "PYTHONPATH": str(Path(__file__).parent / "src")
+            "PYTHONPATH": str(SRC_DIR)
         }
     }
 }
 
-print("```json")
-print(json.dumps(cursor_config, indent=2))
-print("```")
+print_json_block(cursor_config)
 
 # 6. Alternative configurations
 print("\n6️⃣ Alternative Configurations to Try:")
@@ -102,39 +167,38 @@ print("\nOption A - Direct Python:")
 alt_config1 = {
     "osm-edit": {
         "command": sys.executable,
-        "args": [str(Path(__file__).parent / "main.py")],
-        "cwd": str(Path(__file__).parent),
+        "args": [str(MAIN_SCRIPT)],
+        "cwd": str(PROJECT_ROOT),
         "env": {
-            "PYTHONPATH": str(Path(__file__).parent / "src")
+            "PYTHONPATH": str(SRC_DIR)
         }
     }
 }
-print("```json")
-print(json.dumps(alt_config1, indent=2))
-print("```")
+print_json_block(alt_config1)
 
 # With absolute path to uv
 print("\nOption B - Absolute uv path:")
-uv_path = subprocess.run(["which", "uv"], capture_output=True, text=True).stdout.strip()
+uv_path = shutil.which("uv")
 if uv_path:
     alt_config2 = {
         "osm-edit": {
             "command": uv_path,
             "args": ["run", "python", "main.py"],
-            "cwd": str(Path(__file__).parent)
+            "cwd": str(PROJECT_ROOT)
         }
     }
-    print("```json")
-    print(json.dumps(alt_config2, indent=2))
-    print("```")
+    print_json_block(alt_config2)
 
-print("\n7️⃣ Troubleshooting Steps:")
-print("1. Restart Cursor after changing configuration")
-print("2. Check Cursor logs: View → Output → MCP")
-print("3. Try the alternative configurations above")
-print("4. Make sure all dependencies are installed: uv sync")
-print("5. Check if .env file exists with proper configuration")
+print("\n".join([
+    "\n7️⃣ Troubleshooting Steps:",
+    "1. Restart Cursor after changing configuration",
+    "2. Check Cursor logs: View → Output → MCP",
+    "3. Try the alternative configurations above",
+    "4. Make sure all dependencies are installed: uv sync",
+    "5. Check if .env file exists with proper configuration",
+]))
 
 print("\n8️⃣ Testing MCP Protocol:")
 print("Run this to simulate MCP communication:")
-print(f"echo '{{\"jsonrpc\":\"2.0\",\"method\":\"initialize\",\"id\":1}}' | uv run python {Path(__file__).parent / 'main.py'}")
\ No newline at end of file
+initialize_request = {"jsonrpc": "2.0", "method": "initialize", "id": 1}
+print(f"echo '{dumps_wire(initialize_request)}' | uv run python {MAIN_SCRIPT}")
\ No newline at end of file
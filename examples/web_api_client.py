@@ -6,12 +6,50 @@ This demonstrates how to use the REST API from any application.
 """
 
 import asyncio
+import copy
 import httpx
 import json
-from typing import Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# HTTP/2 lets concurrent requests share one connection; httpx needs the
+# optional h2 package for it (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:  # optional, fall back to the stdlib codec
+    orjson = None
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    """Encode a request body as compact JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _decode(response: httpx.Response) -> Dict[str, Any]:
+    """Decode a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class OSMEditClient:
-    """Client for OSM Edit MCP Web API"""
+    """Client for OSM Edit MCP Web API
+    
+    Use as an async context manager so all requests share one pooled
+    connection:
+    
+        async with OSMEditClient(url, api_key) as client:
+            await client.health_check()
+    """
+    
+    CACHE_SIZE = 1024
     
     def __init__(self, base_url: str, api_key: str):
         self.base_url = base_url.rstrip('/')
@@ -20,13 +58,59 @@ class OSMEditClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        # Geocoding and coordinate lookups are idempotent, so their results
+        # are kept per client; oldest entries are evicted first
+        self._cache: Dict[Tuple, Dict[str, Any]] = {}
+    
+    async def __aenter__(self) -> "OSMEditClient":
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
+    
+    async def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response.
+        
+        The body is encoded compactly here and sent as raw content; the
+        Content-Type header is already a client default.
+        """
+        response = await self._client.post(path, content=_encode(payload))
+        response.raise_for_status()
+        return _decode(response)
+    
+    async def _cached_post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Like _post, but reuse the response for a repeated identical request
+        
+        Only responses whose wrapped tool result succeeded are cached, so a
+        transient upstream failure is retried next time. Callers always get
+        their own copy and may modify it freely.
+        """
+        key = (path, tuple(sorted(payload.items())))
+        if key in self._cache:
+            return copy.deepcopy(self._cache[key])
+        
+        result = await self._post(path, payload)
+        data = result.get("data")
+        if result.get("success") and isinstance(data, dict) and data.get("success"):
+            if len(self._cache) >= self.CACHE_SIZE:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = copy.deepcopy(result)
+        return result
     
     async def health_check(self) -> Dict[str, Any]:
         """Check if the server is healthy"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/health")
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get("/health")
+        response.raise_for_status()
+        return _decode(response)
     
     async def find_nearby_amenities(
         self, 
@@ -36,55 +120,64 @@ class OSMEditClient:
         amenity_type: Optional[str] = None
     ) -> Dict[str, Any]:
         """Find amenities near a location"""
-        data = {
+        return await self._post("/api/nearby-amenities", {
             "lat": lat,
             "lon": lon,
-            "radius_meters": radius_meters
-        }
-        if amenity_type:
-            data["amenity_type"] = amenity_type
-            
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/nearby-amenities",
-                headers=self.headers,
-                json=data
-            )
-            response.raise_for_status()
-            return response.json()
+            "radius_meters": radius_meters,
+            **({"amenity_type": amenity_type} if amenity_type else {})
+        })
     
     async def search_places(self, query: str, limit: int = 10) -> Dict[str, Any]:
         """Search for places by name"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/search",
-                headers=self.headers,
-                json={"query": query, "limit": limit}
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._post("/api/search", {"query": query, "limit": limit})
     
     async def geocode(self, address: str) -> Dict[str, Any]:
         """Convert address to coordinates"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/geocode",
-                headers=self.headers,
-                json={"query": address}
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._cached_post("/api/geocode", {"query": address})
     
     async def validate_coordinates(self, lat: float, lon: float) -> Dict[str, Any]:
         """Validate coordinates and get location info"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/validate-coordinates",
-                headers=self.headers,
-                json={"lat": lat, "lon": lon}
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._cached_post("/api/validate-coordinates", {"lat": lat, "lon": lon})
+
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+async def batch_fetch(
+    calls: List[Callable[[], Awaitable[Dict[str, Any]]]],
+    concurrency: int = 20,
+    retries: int = 3
+) -> List[Dict[str, Any]]:
+    """Run many client calls concurrently, with at most `concurrency` in flight.
+    
+    Each call is a zero-argument callable so it can be retried; rate limit
+    and server errors are retried with exponential backoff. Results are
+    returned in the order of `calls`.
+    
+        results = await batch_fetch(
+            [lambda p=p: client.validate_coordinates(*p) for p in points]
+        )
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(call: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    return await call()
+                except httpx.HTTPStatusError as e:
+                    if attempt == retries or e.response.status_code not in RETRY_STATUS_CODES:
+                        raise
+                await asyncio.sleep(0.5 * 2 ** attempt)
+    
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+def describe_error(e: Exception) -> str:
+    """Format a failed request for the example output"""
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"❌ API Error: {e.response.status_code} - {e.response.text}"
+    return f"❌ Error: {e}"
 
 
 async def main():
@@ -94,65 +187,82 @@ async def main():
     SERVER_URL = "http://localhost:8000"  # or https://your-server.com
     API_KEY = "your-api-key-here"
     
-    # Create client
-    client = OSMEditClient(SERVER_URL, API_KEY)
-    
     print("🌍 OSM Edit MCP Web API Client Example\n")
     
     try:
-        # 1. Health check
-        print("1️⃣ Checking server health...")
-        health = await client.health_check()
-        print(f"   Status: {health['status']}")
-        print(f"   Mode: {health['api_mode']}")
-        print(f"   Version: {health['version']}\n")
+        async with OSMEditClient(SERVER_URL, API_KEY) as client:
+            # The requests don't depend on each other, so send them all at
+            # once and print the results in order. Every request is waited
+            # for, even after one fails, before the client is closed, and a
+            # failure is reported in its own section only.
+            lat, lon = 51.5007, -0.1246  # Big Ben, London
+            results = await asyncio.gather(
+                client.health_check(),
+                client.find_nearby_amenities(
+                    lat, lon, 
+                    radius_meters=500,
+                    amenity_type="restaurant"
+                ),
+                client.search_places("Central Park", limit=5),
+                client.geocode("10 Downing Street, London"),
+                client.validate_coordinates(48.8584, 2.2945),
+                return_exceptions=True
+            )
+            health, restaurants, search_results, geocode_result, validation = results
+            
+            # 1. Health check
+            print("1️⃣ Checking server health...")
+            if isinstance(health, Exception):
+                print(f"   {describe_error(health)}\n")
+            else:
+                print(f"   Status: {health['status']}")
+                print(f"   Mode: {health['api_mode']}")
+                print(f"   Version: {health['version']}\n")
         
-        # 2. Find restaurants near Big Ben, London
-        print("2️⃣ Finding restaurants near Big Ben...")
-        lat, lon = 51.5007, -0.1246
-        restaurants = await client.find_nearby_amenities(
-            lat, lon, 
-            radius_meters=500,
-            amenity_type="restaurant"
-        )
-        if restaurants['success']:
-            data = restaurants['data']
-            print(f"   Found {data['count']} restaurants")
-            for rest in data['elements'][:3]:  # Show first 3
-                name = rest['tags'].get('name', 'Unnamed')
-                cuisine = rest['tags'].get('cuisine', 'Unknown')
-                print(f"   - {name} ({cuisine})")
-        print()
+            # 2. Find restaurants near Big Ben, London
+            print("2️⃣ Finding restaurants near Big Ben...")
+            if isinstance(restaurants, Exception):
+                print(f"   {describe_error(restaurants)}")
+            elif restaurants['success']:
+                data = restaurants['data']
+                print(f"   Found {data['count']} restaurants")
+                for rest in data['elements'][:3]:  # Show first 3
+                    tags = rest.get('tags') or {}
+                    name = tags.get('name', 'Unnamed')
+                    cuisine = tags.get('cuisine', 'Unknown')
+                    print(f"   - {name} ({cuisine})")
+            print()
         
-        # 3. Search for places
-        print("3️⃣ Searching for 'Central Park'...")
-        search_results = await client.search_places("Central Park", limit=5)
-        if search_results['success']:
-            for result in search_results['data'][:3]:
-                print(f"   - {result['display_name']}")
-        print()
+            # 3. Search for places
+            print("3️⃣ Searching for 'Central Park'...")
+            if isinstance(search_results, Exception):
+                print(f"   {describe_error(search_results)}")
+            elif search_results['success']:
+                for result in search_results['data'][:3]:
+                    print(f"   - {result['display_name']}")
+            print()
         
-        # 4. Geocode an address
-        print("4️⃣ Geocoding '10 Downing Street, London'...")
-        geocode_result = await client.geocode("10 Downing Street, London")
-        if geocode_result['success']:
-            data = geocode_result['data']
-            print(f"   Location: {data['display_name']}")
-            print(f"   Coordinates: {data['lat']}, {data['lon']}")
-        print()
+            # 4. Geocode an address
+            print("4️⃣ Geocoding '10 Downing Street, London'...")
+            if isinstance(geocode_result, Exception):
+                print(f"   {describe_error(geocode_result)}")
+            elif geocode_result['success']:
+                data = geocode_result['data']
+                print(f"   Location: {data['display_name']}")
+                print(f"   Coordinates: {data['lat']}, {data['lon']}")
+            print()
         
-        # 5. Validate coordinates
-        print("5️⃣ Validating coordinates (48.8584, 2.2945)...")
-        validation = await client.validate_coordinates(48.8584, 2.2945)
-        if validation['success']:
-            data = validation['data']
-            print(f"   Valid: {data['valid']}")
-            print(f"   Location: {data['display_name']}")
+            # 5. Validate coordinates
+            print("5️⃣ Validating coordinates (48.8584, 2.2945)...")
+            if isinstance(validation, Exception):
+                print(f"   {describe_error(validation)}")
+            elif validation['success']:
+                data = validation['data']
+                print(f"   Valid: {data['valid']}")
+                print(f"   Location: {data['display_name']}")
             
-    except httpx.HTTPStatusError as e:
-        print(f"❌ API Error: {e.response.status_code} - {e.response.text}")
     except Exception as e:
-        print(f"❌ Error: {e}")
+        print(describe_error(e))
 
 
 if __name__ == "__main__":
@@ -1,21 +1,21 @@
 #!/usr/bin/env python3
 """
 Main entry point for the OSM Edit MCP Server
+
+When the package is installed (pip install -e .), prefer the
+`osm-edit-mcp` console script. This wrapper runs the checkout's src/
+when it is present, so local edits are never shadowed by an installed
+copy; otherwise it falls back to the installed package.
 """
 
-import asyncio
 import sys
 from pathlib import Path
 
-# Add the src directory to the Python path
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
-from osm_edit_mcp.server import mcp
+SRC_DIR = Path(__file__).parent / "src"
+if SRC_DIR.is_dir():
+    sys.path.insert(0, str(SRC_DIR))
 
-def main():
-    """Main entry point"""
-    print("Starting OSM Edit MCP Server...")
-    mcp.run()
+from osm_edit_mcp.server import main
 
 if __name__ == "__main__":
     main()
@@ -22,10 +22,42 @@ from dotenv import load_dotenv
 import json
 import keyring
 from datetime import datetime, timedelta
+from functools import cached_property
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Share the token file writer with the server; prefer the checkout's src/
+# like main.py does
+SRC_DIR = Path(__file__).parent / "src"
+if SRC_DIR.is_dir():
+    sys.path.insert(0, str(SRC_DIR))
+
+from osm_edit_mcp.token_store import write_token_file
+
+# uvloop is an optional, faster drop-in event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Load environment variables
 load_dotenv()
 
+# Treat tokens this close to expiry as already expired
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=5)
+
+# How long to trust the in-memory copy of the keyring access token
+ACCESS_TOKEN_CACHE_TTL = timedelta(minutes=5)
+
+BANNER_RULE = "=" * 50
+
 class OSMOAuth:
     def __init__(self, use_dev_api=True):
         self.use_dev_api = use_dev_api
@@ -56,8 +88,56 @@ class OSMOAuth:
         print(f"🔑 Client ID: {self.client_id}")
         print(f"🔄 Redirect URI: {self.redirect_uri}")
 
-    def get_authorization_url(self):
-        """Generate the authorization URL for OAuth flow."""
+        self.keyring_service = f"osm-edit-mcp-{'dev' if self.use_dev_api else 'prod'}"
+        self.token_file = ".osm_token_dev.json" if self.use_dev_api else ".osm_token_prod.json"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refresh_lock = asyncio.Lock()
+        # (access token, time to re-read it from the keyring)
+        self._access_token_cache: Optional[Tuple[str, datetime]] = None
+
+    def _get_client(self):
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            )
+        return self._client
+
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _read_token_file(self):
+        """Return the contents of the token file, or None if it can't be read."""
+        try:
+            with open(self.token_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load_cached_token(self):
+        """Return the saved token data if it is not about to expire.
+
+        Returns None when the token file is missing or unreadable, or when
+        the token expires within the next five minutes.
+        """
+        token_data = self._read_token_file()
+        try:
+            expires_at = datetime.fromisoformat(token_data["expires_at"])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        if datetime.now() >= expires_at - TOKEN_EXPIRY_MARGIN:
+            return None
+        return token_data
+
+    @cached_property
+    def authorization_url(self):
+        """The authorization URL for the OAuth flow, built once per instance."""
         params = {
             "response_type": "code",
             "client_id": self.client_id,
@@ -66,8 +146,37 @@ class OSMOAuth:
             "state": "oauth_flow"
         }
 
-        url = f"{self.auth_url}?{urlencode(params)}"
-        return url
+        return f"{self.auth_url}?{urlencode(params)}"
+
+    def get_authorization_url(self):
+        """Generate the authorization URL for OAuth flow."""
+        return self.authorization_url
+
+    def _get_access_token(self):
+        """Return the access token, reading the keyring at most every few minutes."""
+        now = datetime.now()
+        if self._access_token_cache and self._access_token_cache[1] > now:
+            return self._access_token_cache[0]
+
+        access_token = keyring.get_password(self.keyring_service, "access_token")
+        self._access_token_cache = (access_token, now + ACCESS_TOKEN_CACHE_TTL) if access_token else None
+        return access_token
+
+    def _save_token(self, token_data):
+        """Store token data in the keyring and the token file."""
+        keyring.set_password(self.keyring_service, "access_token", token_data["access_token"])
+        self._access_token_cache = (token_data["access_token"], datetime.now() + ACCESS_TOKEN_CACHE_TTL)
+
+        if "refresh_token" in token_data:
+            keyring.set_password(self.keyring_service, "refresh_token", token_data["refresh_token"])
+
+        # Also save token data to a file as backup
+        token_data["expires_at"] = (datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600))).isoformat()
+        self._write_token_file(token_data)
+
+    def _write_token_file(self, token_data):
+        """Replace the token file atomically, readable only by the owner."""
+        write_token_file(self.token_file, token_data)
 
     async def exchange_code_for_token(self, authorization_code):
         """Exchange authorization code for access token."""
@@ -80,78 +189,154 @@ class OSMOAuth:
                 "redirect_uri": self.redirect_uri
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.token_url,
-                    data=data,
-                    headers={"Accept": "application/json"}
-                )
+            client = self._get_client()
+            response = await client.post(
+                self.token_url,
+                data=data,
+                headers={"Accept": "application/json"}
+            )
 
-                if response.status_code == 200:
-                    token_data = response.json()
+            if response.status_code == 200:
+                token_data = response.json()
+                self._save_token(token_data)
 
-                    # Save token to keyring
-                    keyring_service = f"osm-edit-mcp-{'dev' if self.use_dev_api else 'prod'}"
-                    keyring.set_password(keyring_service, "access_token", token_data["access_token"])
+                print(f"✅ Token saved to keyring and {self.token_file}")
+                return token_data
+            else:
+                print(f"❌ Token exchange failed: {response.status_code}")
+                print(f"Response: {response.text}")
+                return None
 
-                    if "refresh_token" in token_data:
-                        keyring.set_password(keyring_service, "refresh_token", token_data["refresh_token"])
+        except Exception as e:
+            print(f"❌ Error during token exchange: {e}")
+            return None
 
-                    # Also save token data to a file as backup
-                    token_file = ".osm_token_dev.json" if self.use_dev_api else ".osm_token_prod.json"
-                    with open(token_file, "w") as f:
-                        token_data["expires_at"] = (datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600))).isoformat()
-                        json.dump(token_data, f, indent=2)
+    async def refresh_access_token(self, expired_token=None):
+        """Get a new access token using the stored refresh token.
+
+        Concurrent callers share one refresh: whoever gets the lock first
+        refreshes, and the rest pick up the token it saved. Pass the access
+        token that was rejected as expired_token so a saved token that is
+        still fresh but was already rejected is not handed back.
+
+        Returns the new token data, or None if no refresh token is stored
+        or the token endpoint rejects it.
+        """
+        token_data = self._load_cached_token()
+        if token_data and token_data.get("access_token") != expired_token:
+            return token_data
+
+        async with self._refresh_lock:
+            # Someone else may have refreshed while we waited
+            token_data = self._load_cached_token()
+            if token_data and token_data.get("access_token") != expired_token:
+                return token_data
+            return await self._request_refreshed_token()
+
+    async def _request_refreshed_token(self):
+        """POST the refresh_token grant and save the result."""
+        try:
+            refresh_token = keyring.get_password(self.keyring_service, "refresh_token")
+            if not refresh_token:
+                return None
+
+            data = {
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret
+            }
 
-                    print(f"✅ Token saved to keyring and {token_file}")
-                    return token_data
-                else:
-                    print(f"❌ Token exchange failed: {response.status_code}")
-                    print(f"Response: {response.text}")
-                    return None
+            client = self._get_client()
+            response = await client.post(
+                self.token_url,
+                data=data,
+                headers={"Accept": "application/json"}
+            )
+
+            if response.status_code == 200:
+                token_data = response.json()
+                # Keep using the old refresh token if the server did not rotate it
+                token_data.setdefault("refresh_token", refresh_token)
+                # Same account, so keep the identity recorded with the old token
+                previous = self._read_token_file() or {}
+                for key in ("username", "user_id"):
+                    if key in previous:
+                        token_data.setdefault(key, previous[key])
+                self._save_token(token_data)
+
+                print(f"🔄 Access token refreshed and saved to {self.token_file}")
+                return token_data
+            else:
+                print(f"❌ Token refresh failed: {response.status_code}")
+                return None
 
         except Exception as e:
-            print(f"❌ Error during token exchange: {e}")
+            print(f"❌ Error during token refresh: {e}")
             return None
 
-    async def test_authentication(self):
-        """Test if the current authentication works."""
+    async def test_authentication(self, refresh=True):
+        """Test if the current authentication works.
+
+        An expired access token is refreshed once before giving up, unless
+        refresh is False (e.g. because a refresh has just failed).
+        """
         try:
             # Get token from keyring
-            keyring_service = f"osm-edit-mcp-{'dev' if self.use_dev_api else 'prod'}"
-            access_token = keyring.get_password(keyring_service, "access_token")
+            access_token = self._get_access_token()
 
             if not access_token:
                 print("❌ No access token found. Please authenticate first.")
                 return False
 
-            # Test API call with authentication
-            headers = {"Authorization": f"Bearer {access_token}"}
-
-            async with httpx.AsyncClient() as client:
-                # Test with user details endpoint
-                response = await client.get(
-                    f"{self.api_base}/api/0.6/user/details",
-                    headers=headers
-                )
-
-                if response.status_code == 200:
-                    print("✅ Authentication successful!")
-
-                    # Parse user info from XML
-                    import xml.etree.ElementTree as ET
-                    root = ET.fromstring(response.text)
-                    user = root.find("user")
-                    if user is not None:
-                        display_name = user.get("display_name")
-                        user_id = user.get("id")
-                        print(f"👤 Logged in as: {display_name} (ID: {user_id})")
-
+            # Test with user details endpoint
+            client = self._get_client()
+            user_details_url = f"{self.api_base}/api/0.6/user/details"
+            response = await client.get(
+                user_details_url,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+
+            if response.status_code == 401 and refresh:
+                token_data = await self.refresh_access_token(expired_token=access_token)
+                if token_data:
+                    response = await client.get(
+                        user_details_url,
+                        headers={"Authorization": f"Bearer {token_data['access_token']}"}
+                    )
+
+            if response.status_code == 401:
+                # Don't keep handing out a token the API has rejected
+                self._access_token_cache = None
+
+            if response.status_code == 200:
+                print("✅ Authentication successful!")
+
+                # The identity is saved with the token after the first check
+                token_data = self._read_token_file()
+                if token_data and token_data.get("username"):
+                    print(f"👤 Logged in as: {token_data['username']} (ID: {token_data.get('user_id')})")
                     return True
-                else:
-                    print(f"❌ Authentication test failed: {response.status_code}")
-                    print(f"Response: {response.text}")
-                    return False
+
+                # Parse user info from XML
+                import xml.etree.ElementTree as ET
+                root = ET.fromstring(response.text)
+                user = root.find("user")
+                if user is not None:
+                    display_name = user.get("display_name")
+                    user_id = user.get("id")
+                    print(f"👤 Logged in as: {display_name} (ID: {user_id})")
+
+                    if token_data:
+                        token_data["username"] = display_name
+                        token_data["user_id"] = user_id
+                        self._write_token_file(token_data)
+
+                return True
+            else:
+                print(f"❌ Authentication test failed: {response.status_code}")
+                print(f"Response: {response.text}")
+                return False
 
         except Exception as e:
             print(f"❌ Error testing authentication: {e}")
@@ -159,8 +344,7 @@ class OSMOAuth:
 
 async def main():
     """Main OAuth authentication flow."""
-    print("🚀 OSM Edit MCP Server - OAuth Authentication")
-    print("=" * 50)
+    print(f"🚀 OSM Edit MCP Server - OAuth Authentication\n{BANNER_RULE}")
 
     # Determine which API to use
     use_dev_api = True  # Default to dev for safety
@@ -199,16 +383,40 @@ async def main():
             print("Please set OSM_PROD_CLIENT_ID and OSM_PROD_CLIENT_SECRET in your .env file")
         return
 
-    # Test if we already have valid authentication
+    try:
+        await run_oauth_flow(oauth)
+    finally:
+        await oauth.close()
+
+async def run_oauth_flow(oauth):
+    """Authenticate interactively unless a working token already exists."""
+    # A saved token that is well within its lifetime needs no network check
+    cached_token = oauth._load_cached_token()
+    if cached_token:
+        print(f"\n✅ Saved token is valid until {cached_token['expires_at']}")
+        if cached_token.get("username"):
+            print(f"👤 Logged in as: {cached_token['username']} (ID: {cached_token.get('user_id')})")
+        print("🎉 You're already authenticated! Ready to use the MCP server.")
+        return
+
+    # A saved token that is expired or about to expire can usually be
+    # renewed without going through the browser again
+    tried_refresh = os.path.exists(oauth.token_file)
+    if tried_refresh and await oauth.refresh_access_token():
+        print("🎉 You're already authenticated! Ready to use the MCP server.")
+        return
+
+    # Test if we already have valid authentication; there is no point in
+    # sending a refresh token that was just rejected a second time
     print("\n📋 Testing existing authentication...")
-    if await oauth.test_authentication():
+    if await oauth.test_authentication(refresh=not tried_refresh):
         print("🎉 You're already authenticated! Ready to use the MCP server.")
         return
 
     print("\n🔐 Starting OAuth authentication flow...")
 
     # Step 1: Get authorization URL
-    auth_url = oauth.get_authorization_url()
+    auth_url = oauth.authorization_url
     print(f"\n📝 Step 1: Please visit this URL to authorize the application:")
     print(f"🔗 {auth_url}")
 
@@ -265,4 +473,5 @@ async def main():
         print("❌ Token exchange failed")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run = uvloop.run if uvloop is not None else asyncio.run
+    run(main())
\ No newline at end of file
@@ -8,6 +8,12 @@ import sys
 import asyncio
 from pathlib import Path
 
+# uvloop is an optional, faster drop-in event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -38,7 +44,8 @@ async def check_health():
 
 def main():
     """Run health check and exit with appropriate code."""
-    exit_code = asyncio.run(check_health())
+    run = uvloop.run if uvloop is not None else asyncio.run
+    exit_code = run(check_health())
     sys.exit(exit_code)
 
 
@@ -9,16 +9,112 @@ import os
 import sys
 import json
 import re
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional, fall back to the stdlib encoder
+    orjson = None
+
+
+# A logger call or print() whose arguments mention a credential
+SENSITIVE_LOG_PATTERN = re.compile(
+    r'(?:logger\.\w+|print)\([^)]*(?:password|secret|token)[^)]*\)',
+    re.IGNORECASE
+)
+
+BANNER_RULE = "=" * 60
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_SCAN_THRESHOLD = 200
+
+
+def scan_with_ripgrep(root_path: Path, skip_dirs) -> Optional[Dict[Path, int]]:
+    """Run the sensitive logging scan through ripgrep, if it is installed.
+    
+    ripgrep walks root_path itself, with the same exclusions as
+    SecurityAuditor.iter_source_files, so the command line stays short on
+    any size of tree. Returns the first matching line number per matching
+    file, or None if ripgrep is unavailable or fails so the caller can
+    fall back to the Python scan.
+    """
+    rg = shutil.which("rg")
+    if rg is None:
+        return None
+    
+    # --no-ignore/--hidden: visit the same files as os.walk would. Globs are
+    # relative to root_path, like the filters in iter_source_files; '*.py'
+    # rather than --type py, which also matches .pyi files
+    args = [rg, "--json", "--no-ignore", "--hidden", "-g", "*.py", "-g", "!*test*", "-g", "!*venv*/"]
+    for name in sorted(skip_dirs):
+        args += ["-g", f"!{name}/"]
+    # -U lets [^)] cross newlines like the Python pattern does
+    args += ["-U", "-i", "-m", "1", "-e", SENSITIVE_LOG_PATTERN.pattern, "--", str(root_path)]
+    
+    try:
+        result = subprocess.run(args, capture_output=True, text=True)
+        # Exit status 1 just means no file matched
+        if result.returncode not in (0, 1):
+            return None
+        
+        first_lines: Dict[Path, int] = {}
+        for event in result.stdout.splitlines():
+            event = json.loads(event)
+            if event["type"] == "match":
+                data = event["data"]
+                # Non-UTF-8 paths come back as {"bytes": ...} and raise here
+                first_lines.setdefault(Path(data["path"]["text"]), data["line_number"])
+        return first_lines
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def find_sensitive_logging(content: str) -> Optional[int]:
+    """Return the line number of the first sensitive logging call, if any."""
+    match = SENSITIVE_LOG_PATTERN.search(content)
+    if match:
+        return content.count("\n", 0, match.start()) + 1
+    return None
+
+
+def normalize_gitignore_entry(entry: str) -> str:
+    """Reduce a .gitignore entry to the name it matches.
+    
+    Anchors and directory markers are dropped, so '/.env', '**/.env' and
+    '.env/' all become '.env'.
+    """
+    entry = entry.strip()
+    if entry.startswith("**/"):
+        entry = entry[3:]
+    elif entry.startswith("/"):
+        entry = entry[1:]
+    return entry.rstrip("/")
+
+
+def scan_file_for_sensitive_logging(path: Path) -> Optional[int]:
+    """Read a file and run find_sensitive_logging on it (worker entry point)."""
+    with open(path, 'r') as f:
+        return find_sensitive_logging(f.read())
 
 
 class SecurityAuditor:
     """Perform security audit on OSM Edit MCP Server."""
     
+    CLIENT_SECRET_PATTERN = re.compile(r'client_secret\s*=\s*["\'][^"\']+["\']')
+    VALIDATE_FUNCTION_PATTERN = re.compile(r'def\s+validate_\w+')
+    VERSION_OPERATORS = (">=", "~=", "==")
+    
+    # Directories that never contain project source
+    SKIP_DIRS = {".git", ".venv", "venv", "__pycache__", "node_modules", ".tox", "build", "dist"}
+    
     def __init__(self, root_path: Path):
         self.root_path = root_path
         self.issues: List[Dict[str, Any]] = []
+        self._file_cache: Dict[Path, str] = {}
         
     def add_issue(self, severity: str, category: str, description: str, file_path: str = None, line: int = None):
         """Add a security issue."""
@@ -30,6 +126,30 @@ class SecurityAuditor:
             "line": line
         })
     
+    def read_file(self, path: Path) -> str:
+        """Return a file's text, reading it from disk once per audit."""
+        if path not in self._file_cache:
+            with open(path, 'r') as f:
+                self._file_cache[path] = f.read()
+        return self._file_cache[path]
+    
+    def iter_source_files(self):
+        """Yield the project's non-test Python files.
+        
+        Virtualenvs, VCS metadata, caches and build output are pruned
+        during the walk instead of being filtered out afterwards.
+        """
+        for dirpath, dirnames, filenames in os.walk(self.root_path):
+            dirnames[:] = [d for d in dirnames if d not in self.SKIP_DIRS]
+            # Only look below the root, so a checkout that itself lives under
+            # e.g. /home/u/latest/ is still scanned
+            relative_dir = str(Path(dirpath).relative_to(self.root_path))
+            if "test" in relative_dir or "venv" in relative_dir:
+                continue
+            for name in filenames:
+                if name.endswith(".py") and "test" not in name:
+                    yield Path(dirpath) / name
+    
     def check_sensitive_files(self):
         """Check for sensitive files that shouldn't be committed."""
         print("🔍 Checking for sensitive files...")
@@ -45,11 +165,14 @@ class SecurityAuditor:
         
         gitignore_path = self.root_path / ".gitignore"
         if gitignore_path.exists():
-            with open(gitignore_path, 'r') as f:
-                gitignore_content = f.read()
+            gitignore_content = self.read_file(gitignore_path)
+            ignored = {
+                normalize_gitignore_entry(line) for line in gitignore_content.splitlines()
+                if line.strip() and not line.lstrip().startswith('#')
+            }
             
             for pattern in sensitive_patterns:
-                if pattern not in gitignore_content:
+                if pattern not in ignored:
                     self.add_issue(
                         "HIGH",
                         "Configuration",
@@ -69,11 +192,10 @@ class SecurityAuditor:
         
         oauth_file = self.root_path / "oauth_auth.py"
         if oauth_file.exists():
-            with open(oauth_file, 'r') as f:
-                content = f.read()
+            content = self.read_file(oauth_file)
             
             # Check for hardcoded credentials
-            if re.search(r'client_secret\s*=\s*["\'][^"\']+["\']', content):
+            if self.CLIENT_SECRET_PATTERN.search(content):
                 self.add_issue(
                     "CRITICAL",
                     "Authentication",
@@ -96,8 +218,7 @@ class SecurityAuditor:
         
         server_file = self.root_path / "src" / "osm_edit_mcp" / "server.py"
         if server_file.exists():
-            with open(server_file, 'r') as f:
-                content = f.read()
+            content = self.read_file(server_file)
             
             # Check for HTTPS usage
             if "http://" in content and "https://" not in content:
@@ -118,7 +239,7 @@ class SecurityAuditor:
                 )
             
             # Check for input validation
-            if not re.search(r'def\s+validate_\w+', content):
+            if not self.VALIDATE_FUNCTION_PATTERN.search(content):
                 self.add_issue(
                     "MEDIUM",
                     "Validation",
@@ -133,11 +254,11 @@ class SecurityAuditor:
         # This is a simplified check - in production, use tools like safety or pip-audit
         requirements_file = self.root_path / "requirements.txt"
         if requirements_file.exists():
+            # Check for minimum versions, stopping at the first constrained line
             with open(requirements_file, 'r') as f:
-                deps = f.read()
+                has_constraints = any(op in line for line in f for op in self.VERSION_OPERATORS)
             
-            # Check for minimum versions
-            if not re.search(r'>=|~=|==', deps):
+            if not has_constraints:
                 self.add_issue(
                     "MEDIUM",
                     "Dependencies",
@@ -149,37 +270,30 @@ class SecurityAuditor:
         """Check for secure logging practices."""
         print("📝 Checking logging security...")
         
-        for py_file in self.root_path.rglob("*.py"):
-            if "test" in str(py_file) or ".venv" in str(py_file) or "venv" in str(py_file):
-                continue
-                
-            with open(py_file, 'r') as f:
-                content = f.read()
-            
-            # Check for logging of sensitive data
-            sensitive_log_patterns = [
-                r'logger\.\w+\([^)]*password[^)]*\)',
-                r'logger\.\w+\([^)]*secret[^)]*\)',
-                r'logger\.\w+\([^)]*token[^)]*\)',
-                r'print\([^)]*password[^)]*\)',
-                r'print\([^)]*secret[^)]*\)',
-                r'print\([^)]*token[^)]*\)'
-            ]
-            
-            for pattern in sensitive_log_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    self.add_issue(
-                        "HIGH",
-                        "Logging",
-                        "Potential logging of sensitive data",
-                        str(py_file)
-                    )
+        # Check for logging of sensitive data. Prefer ripgrep; without it,
+        # files are independent, so large trees are scanned across all cores
+        matches = scan_with_ripgrep(self.root_path, self.SKIP_DIRS)
+        if matches is None:
+            py_files = list(self.iter_source_files())
+            if len(py_files) > PARALLEL_SCAN_THRESHOLD:
+                with ProcessPoolExecutor() as executor:
+                    lines = list(executor.map(scan_file_for_sensitive_logging, py_files, chunksize=16))
+            else:
+                lines = [find_sensitive_logging(self.read_file(py_file)) for py_file in py_files]
+            matches = {py_file: line for py_file, line in zip(py_files, lines) if line is not None}
+        
+        for py_file, line in sorted(matches.items()):
+            self.add_issue(
+                "HIGH",
+                "Logging",
+                "Potential logging of sensitive data",
+                str(py_file),
+                line
+            )
     
     def generate_report(self):
         """Generate security audit report."""
-        print("\n" + "=" * 60)
-        print("SECURITY AUDIT REPORT")
-        print("=" * 60)
+        print(f"\n{BANNER_RULE}\nSECURITY AUDIT REPORT\n{BANNER_RULE}")
         
         if not self.issues:
             print("✅ No security issues found!")
@@ -219,20 +333,23 @@ class SecurityAuditor:
         # Save to file
         report_path = self.root_path / "security_audit_report.json"
         from datetime import datetime
-        with open(report_path, 'w') as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "total_issues": len(self.issues),
-                "by_severity": {k: len(v) for k, v in by_severity.items()},
-                "issues": self.issues
-            }, f, indent=2)
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "total_issues": len(self.issues),
+            "by_severity": {k: len(v) for k, v in by_severity.items()},
+            "issues": self.issues
+        }
+        if orjson is not None:
+            report_path.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2)
         
         print(f"\nDetailed report saved to: {report_path}")
     
     def run_audit(self):
         """Run all security checks."""
-        print("🔒 Starting Security Audit for OSM Edit MCP Server")
-        print("=" * 60)
+        print(f"🔒 Starting Security Audit for OSM Edit MCP Server\n{BANNER_RULE}")
         
         self.check_sensitive_files()
         self.check_oauth_security()
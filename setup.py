@@ -1,11 +1,16 @@
 #!/usr/bin/env python
 """Setup script for OSM Edit MCP Server."""
 
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
-# Read long description from README
-with open("README.md", "r", encoding="utf-8") as fh:
-    long_description = fh.read()
+
+def _readme():
+    """Return README.md next to this file, or "" if it isn't there."""
+    readme = Path(__file__).with_name("README.md")
+    return readme.read_text(encoding="utf-8") if readme.exists() else ""
+
 
 setup(
     name="osm-edit-mcp",
@@ -13,7 +18,7 @@ setup(
     author="pk",
     author_email="right.crew7885@fastmail.com",
     description="Model Context Protocol server for editing OpenStreetMap data",
-    long_description=long_description,
+    long_description=_readme(),
     long_description_content_type="text/markdown",
     url="https://github.com/skywinder/osm-edit-mcp",
     project_urls={
@@ -47,7 +52,6 @@ setup(
         "anyio>=3.0.0",
         "structlog>=23.0.0",
         "requests>=2.31.0",
-        "aiofiles>=23.0.0",
         "aiohttp>=3.12.13",
     ],
     extras_require={
@@ -4,9 +4,18 @@ OSM Edit MCP Server
 A simple Model Context Protocol server for OpenStreetMap editing operations.
 """
 
+from typing import Any
+
 __version__ = "0.1.0"
 __author__ = "OSM Edit MCP"
 
-from .server import mcp
+__all__ = ["mcp", "main"]
+
 
-__all__ = ["mcp"]
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    # Importing the server pulls in httpx, FastMCP and the OAuth stack, so
+    # defer it until one of its exports is actually used (PEP 562)
+    if name in __all__:
+        from . import server
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,16 +8,22 @@ Supports reading, fetching, and updating OSM data with changeset management.
 import os
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 import httpx
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 from authlib.integrations.httpx_client import AsyncOAuth2Client
 import json
+from collections import Counter
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import datetime
 import xml.etree.ElementTree as ET
 
+from .token_store import write_token_file
+
 # Initialize FastMCP server
 mcp = FastMCP("osm-edit-mcp")
 
@@ -143,8 +149,11 @@ def setup_logging():
 # Initialize logging
 logger = setup_logging()
 
-# Global client instance
-osm_client = None
+# Global client instance, shared by unauthenticated requests so they reuse
+# pooled connections. An httpx client is tied to the event loop it was
+# first used on, so the loop is remembered and a new client made if it changes.
+osm_client: Optional[httpx.AsyncClient] = None
+_osm_client_loop: Optional[asyncio.AbstractEventLoop] = None
 
 # OAuth token management
 def load_oauth_token() -> Optional[Dict[str, Any]]:
@@ -161,6 +170,12 @@ def load_oauth_token() -> Optional[Dict[str, Any]]:
         logger.error(f"Failed to load OAuth token: {e}")
         return None
 
+def save_oauth_token(token_data: Dict[str, Any]) -> None:
+    """Save OAuth token to file atomically"""
+    token_file = '.osm_token_dev.json' if config.osm_use_dev_api else '.osm_token_prod.json'
+    write_token_file(token_file, token_data)
+    logger.debug(f"Saved OAuth token to {token_file}")
+
 def get_authenticated_client() -> httpx.AsyncClient:
     """Get HTTP client with OAuth authentication if available"""
     token_data = load_oauth_token()
@@ -175,6 +190,24 @@ def get_authenticated_client() -> httpx.AsyncClient:
         logger.debug("Using unauthenticated HTTP client")
         return httpx.AsyncClient(headers={'User-Agent': 'OSM-Edit-MCP-Server/0.1.0'})
 
+@asynccontextmanager
+async def shared_http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the process-wide HTTP client; unlike AsyncClient, it stays open on exit"""
+    global osm_client, _osm_client_loop
+    loop = asyncio.get_running_loop()
+    if osm_client is None or _osm_client_loop is not loop:
+        osm_client = httpx.AsyncClient()
+        _osm_client_loop = loop
+    yield osm_client
+
+async def close_shared_http_client() -> None:
+    """Close the process-wide HTTP client, e.g. on application shutdown"""
+    global osm_client, _osm_client_loop
+    if osm_client is not None:
+        await osm_client.aclose()
+        osm_client = None
+        _osm_client_loop = None
+
 def get_current_user_info() -> Optional[Dict[str, Any]]:
     """Get current authenticated user information"""
     token_data = load_oauth_token()
@@ -188,6 +221,8 @@ def get_current_user_info() -> Optional[Dict[str, Any]]:
     return None
 
 # Helper functions
+OSM_ELEMENT_TYPES = frozenset({"node", "way", "relation"})
+
 def parse_osm_xml(xml_content: str) -> Dict[str, Any]:
     """Parse OSM XML response into JSON format."""
     try:
@@ -195,7 +230,7 @@ def parse_osm_xml(xml_content: str) -> Dict[str, Any]:
         result = {"elements": []}
 
         for element in root:
-            if element.tag in ["node", "way", "relation"]:
+            if element.tag in OSM_ELEMENT_TYPES:
                 elem_data = {
                     "type": element.tag,
                     "id": int(element.get("id", 0)),
@@ -211,21 +246,19 @@ def parse_osm_xml(xml_content: str) -> Dict[str, Any]:
                     elem_data["lat"] = float(element.get("lat", 0))
                     elem_data["lon"] = float(element.get("lon", 0))
                 elif element.tag == "way":
-                    elem_data["nodes"] = []
-                    for nd in element.findall("nd"):
-                        elem_data["nodes"].append(int(nd.get("ref")))
+                    elem_data["nodes"] = [int(nd.get("ref")) for nd in element.iterfind("nd")]
                 elif element.tag == "relation":
-                    elem_data["members"] = []
-                    for member in element.findall("member"):
-                        elem_data["members"].append({
+                    elem_data["members"] = [
+                        {
                             "type": member.get("type"),
                             "ref": int(member.get("ref")),
                             "role": member.get("role", "")
-                        })
+                        }
+                        for member in element.iterfind("member")
+                    ]
 
                 # Parse tags
-                for tag in element.findall("tag"):
-                    elem_data["tags"][tag.get("k")] = tag.get("v")
+                elem_data["tags"] = {tag.get("k"): tag.get("v") for tag in element.iterfind("tag")}
 
                 result["elements"].append(elem_data)
 
@@ -247,7 +280,7 @@ async def get_osm_node(node_id: int) -> Dict[str, Any]:
     try:
         url = f"{config.current_api_base_url}/node/{node_id}"
         logger.debug(f"Fetching node {node_id} from {url}")
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url)
             response.raise_for_status()
             parsed_data = parse_osm_xml(response.text)
@@ -276,7 +309,7 @@ async def get_osm_way(way_id: int) -> Dict[str, Any]:
     try:
         url = f"{config.current_api_base_url}/way/{way_id}"
         logger.debug(f"Fetching way {way_id} from {url}")
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url)
             response.raise_for_status()
             parsed_data = parse_osm_xml(response.text)
@@ -305,7 +338,7 @@ async def get_osm_relation(relation_id: int) -> Dict[str, Any]:
     try:
         url = f"{config.current_api_base_url}/relation/{relation_id}"
         logger.debug(f"Fetching relation {relation_id} from {url}")
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url)
             response.raise_for_status()
             parsed_data = parse_osm_xml(response.text)
@@ -334,7 +367,7 @@ async def get_osm_elements_in_area(bbox: str) -> Dict[str, Any]:
     try:
         url = f"{config.current_api_base_url}/map?bbox={bbox}"
         logger.debug(f"Fetching elements in bbox {bbox} from {url}")
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url)
             response.raise_for_status()
             parsed_data = parse_osm_xml(response.text)
@@ -434,7 +467,7 @@ async def get_changeset(changeset_id: int) -> Dict[str, Any]:
     try:
         url = f"{config.current_api_base_url}/changeset/{changeset_id}"
         logger.debug(f"Fetching changeset {changeset_id} from {url}")
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url)
             response.raise_for_status()
             parsed_data = parse_osm_xml(response.text)
@@ -580,13 +613,10 @@ async def check_authentication() -> Dict[str, Any]:
 
             # Update token file with user info
             token_data = load_oauth_token()
-            if token_data:
+            if token_data and (token_data.get('username'), token_data.get('user_id')) != (username, user_id):
                 token_data['username'] = username
                 token_data['user_id'] = user_id
-
-                token_file = '.osm_token_dev.json' if config.osm_use_dev_api else '.osm_token_prod.json'
-                with open(token_file, 'w') as f:
-                    json.dump(token_data, f, indent=2)
+                save_oauth_token(token_data)
 
                 logger.info(f"Updated user info: {token_data['username']} (ID: {token_data['user_id']})")
 
@@ -674,7 +704,7 @@ async def find_nearby_amenities(lat: float, lon: float, radius_meters: int = 100
 
         overpass_url = "https://overpass-api.de/api/interpreter"
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.post(
                 overpass_url,
                 data=overpass_query,
@@ -768,7 +798,7 @@ async def validate_coordinates(lat: float, lon: float) -> Dict[str, Any]:
             # Try to get reverse geocoding from OSM Nominatim
             try:
                 nominatim_url = f"https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={lon}&zoom=18&addressdetails=1"
-                async with httpx.AsyncClient() as client:
+                async with shared_http_client() as client:
                     response = await client.get(nominatim_url, headers={"User-Agent": "OSM-Edit-MCP-Server"})
                     if response.status_code == 200:
                         location_data = response.json()
@@ -808,7 +838,7 @@ async def get_place_info(place_name: str) -> Dict[str, Any]:
         # Use Nominatim to search for the place
         nominatim_url = f"https://nominatim.openstreetmap.org/search?format=json&q={place_name}&limit=5&addressdetails=1"
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(nominatim_url, headers={"User-Agent": "OSM-Edit-MCP-Server"})
             response.raise_for_status()
             places = response.json()
@@ -887,7 +917,7 @@ async def search_osm_elements(query: str, element_type: str = "all") -> Dict[str
 
         overpass_url = "https://overpass-api.de/api/interpreter"
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.post(
                 overpass_url,
                 data=overpass_query,
@@ -1171,6 +1201,7 @@ ACTION_MAPPINGS = {
     'find': ['find', 'search', 'locate', 'show', 'get', 'look for', 'discover']
 }
 
+@lru_cache(maxsize=1024)
 def extract_action_from_text(text: str) -> str:
     """Extract action type from natural language text."""
     text_lower = text.lower()
@@ -1193,6 +1224,17 @@ def map_features_to_tags(features: List[str]) -> Dict[str, str]:
         tags.update(feature_tags)
     return tags
 
+# Patterns for parse_natural_language_request, compiled once at import
+NAMED_PATTERN = re.compile(r'(?:called|named)\s+["\']([^"\']+)["\']', re.IGNORECASE)
+QUOTED_PATTERN = re.compile(r'["\']([^"\']+)["\']')
+COORDINATES_PATTERN = re.compile(r'(?:at|coordinates?)\s*(-?\d+\.?\d*)\s*,\s*(-?\d+\.?\d*)', re.IGNORECASE)
+ADDRESS_PATTERN = re.compile(r'(?:at|address)\s+([^,]+(?:,\s*[^,]+)*)', re.IGNORECASE)
+LOCATION_PATTERNS = (
+    re.compile(r'(?:near|next to|close to|by)\s+([^,]+)', re.IGNORECASE),
+    re.compile(r'(?:in|at)\s+([^,]+)', re.IGNORECASE),
+    re.compile(r'(?:on|along)\s+([^,]+)', re.IGNORECASE),
+)
+
 def parse_natural_language_request(request: str) -> Dict[str, Any]:
     """Parse natural language request into structured data."""
     request_lower = request.lower()
@@ -1201,15 +1243,14 @@ def parse_natural_language_request(request: str) -> Dict[str, Any]:
     action = extract_action_from_text(request)
 
     # Extract business name (look for quotes or "called" patterns)
-    import re
-    name_match = re.search(r'(?:called|named)\s+["\']([^"\']+)["\']', request, re.IGNORECASE)
+    name_match = NAMED_PATTERN.search(request)
     if not name_match:
-        name_match = re.search(r'["\']([^"\']+)["\']', request)
+        name_match = QUOTED_PATTERN.search(request)
 
     name = name_match.group(1) if name_match else None
 
     # Extract coordinates (look for lat/lon patterns)
-    coord_match = re.search(r'(?:at|coordinates?)\s*(-?\d+\.?\d*)\s*,\s*(-?\d+\.?\d*)', request, re.IGNORECASE)
+    coord_match = COORDINATES_PATTERN.search(request)
     coordinates = None
     if coord_match:
         coordinates = {
@@ -1218,7 +1259,7 @@ def parse_natural_language_request(request: str) -> Dict[str, Any]:
         }
 
     # Extract address (look for address patterns)
-    address_match = re.search(r'(?:at|address)\s+([^,]+(?:,\s*[^,]+)*)', request, re.IGNORECASE)
+    address_match = ADDRESS_PATTERN.search(request)
     address = address_match.group(1).strip() if address_match else None
 
     # Extract business type
@@ -1236,15 +1277,8 @@ def parse_natural_language_request(request: str) -> Dict[str, Any]:
 
     # Extract location references
     location_refs = []
-    location_patterns = [
-        r'(?:near|next to|close to|by)\s+([^,]+)',
-        r'(?:in|at)\s+([^,]+)',
-        r'(?:on|along)\s+([^,]+)'
-    ]
-
-    for pattern in location_patterns:
-        matches = re.findall(pattern, request, re.IGNORECASE)
-        location_refs.extend(matches)
+    for pattern in LOCATION_PATTERNS:
+        location_refs.extend(pattern.findall(request))
 
     return {
         'action': action,
@@ -1642,7 +1676,7 @@ async def create_place_from_description(description: str, changeset_id: Optional
         # Parse the natural language request
         parsed = parse_natural_language_request(description)
 
-        if parsed['action'] not in ['create']:
+        if parsed['action'] != 'create':
             return {
                 "success": False,
                 "error": "Invalid action",
@@ -1734,7 +1768,7 @@ async def find_and_update_place(description: str, changeset_id: Optional[int] =
         # Parse the natural language request
         parsed = parse_natural_language_request(description)
 
-        if parsed['action'] not in ['update']:
+        if parsed['action'] != 'update':
             return {
                 "success": False,
                 "error": "Invalid action",
@@ -1839,7 +1873,7 @@ async def delete_place_from_description(description: str, changeset_id: Optional
         # Parse the natural language request
         parsed = parse_natural_language_request(description)
 
-        if parsed['action'] not in ['delete']:
+        if parsed['action'] != 'delete':
             return {
                 "success": False,
                 "error": "Invalid action",
@@ -1974,6 +2008,10 @@ OPENING_HOURS_PATTERNS = {
     'closed': ['closed', 'shut', 'not open', 'unavailable']
 }
 
+# Simple hour ranges such as "9am-5pm"
+TIME_RANGE_PATTERN = re.compile(r'(\d{1,2})\s*(?:am|pm)?\s*-\s*(\d{1,2})\s*(?:am|pm)?')
+
+@lru_cache(maxsize=1024)
 def parse_opening_hours(text: str) -> str:
     """Parse natural language opening hours to OSM format."""
     text_lower = text.lower()
@@ -1995,9 +2033,7 @@ def parse_opening_hours(text: str) -> str:
                 return 'off'
 
     # Try to parse time patterns (e.g., "9am-5pm")
-    import re
-    time_pattern = r'(\d{1,2})\s*(?:am|pm)?\s*-\s*(\d{1,2})\s*(?:am|pm)?'
-    match = re.search(time_pattern, text_lower)
+    match = TIME_RANGE_PATTERN.search(text_lower)
     if match:
         start, end = match.groups()
         return f'Mo-Su {start.zfill(2)}:00-{end.zfill(2)}:00'
@@ -2100,6 +2136,9 @@ async def bulk_create_places(places_data: List[Dict[str, Any]], changeset_id: Op
             "message": "Failed to bulk create places"
         }
 
+# Tag keys that say what kind of feature an element is
+FEATURE_TYPE_KEYS = frozenset({'amenity', 'shop', 'tourism', 'leisure'})
+
 @mcp.tool()
 async def validate_osm_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate OSM data for quality assurance before uploading.
@@ -2134,7 +2173,7 @@ async def validate_osm_data(data: Dict[str, Any]) -> Dict[str, Any]:
             tags = data['tags']
 
             # Check for required tags
-            if not any(key in tags for key in ['name', 'amenity', 'shop', 'tourism', 'leisure']):
+            if 'name' not in tags and FEATURE_TYPE_KEYS.isdisjoint(tags):
                 warnings.append("No identifying tags found (name, amenity, shop, etc.)")
 
             # Check for common tag issues
@@ -2215,7 +2254,7 @@ async def get_changeset_history(user_id: Optional[int] = None, limit: int = 20)
         url = f"{config.current_api_base_url}/changesets?{query_string}"
         logger.debug(f"Fetching changeset history from {url}")
 
-        async with httpx.AsyncClient() as client:
+        async with shared_http_client() as client:
             response = await client.get(url)
             response.raise_for_status()
 
@@ -2399,16 +2438,26 @@ async def get_osm_statistics(bbox: str) -> Dict[str, Any]:
             'data_quality': {}
         }
 
-        # Count element types
-        for element in elements:
-            element_type = element['type']
-            stats['element_types'][element_type] = stats['element_types'].get(element_type, 0) + 1
-
-        # Analyze tags
+        # Count element types, tags and completeness in a single pass
+        element_types: Counter[str] = Counter()
         all_tags = {}
+        elements_with_names = 0
+        elements_with_types = 0
+        elements_with_coordinates = 0
+        elements_with_tags = 0
         for element in elements:
+            element_types[element['type']] += 1
             tags = element.get('tags', {})
 
+            if tags:
+                elements_with_tags += 1
+            if tags.get('name'):
+                elements_with_names += 1
+            if not FEATURE_TYPE_KEYS.isdisjoint(tags):
+                elements_with_types += 1
+            if 'lat' in element and 'lon' in element:
+                elements_with_coordinates += 1
+
             # Count tag frequency
             for key, value in tags.items():
                 if key not in all_tags:
@@ -2428,6 +2477,8 @@ async def get_osm_statistics(bbox: str) -> Dict[str, Any]:
                 tourism = tags['tourism']
                 stats['tourism_breakdown'][tourism] = stats['tourism_breakdown'].get(tourism, 0) + 1
 
+        stats['element_types'] = dict(element_types)
+
         # Calculate top tags
         stats['tag_frequency'] = {
             key: len(values) for key, values in all_tags.items()
@@ -2441,11 +2492,6 @@ async def get_osm_statistics(bbox: str) -> Dict[str, Any]:
         )[:10])
 
         # Calculate completeness score
-        elements_with_names = sum(1 for el in elements if el.get('tags', {}).get('name'))
-        elements_with_types = sum(1 for el in elements if any(
-            key in el.get('tags', {}) for key in ['amenity', 'shop', 'tourism', 'leisure']
-        ))
-
         if elements:
             stats['completeness_score'] = {
                 'name_coverage': round((elements_with_names / len(elements)) * 100, 1),
@@ -2455,8 +2501,8 @@ async def get_osm_statistics(bbox: str) -> Dict[str, Any]:
 
         # Data quality assessment
         stats['data_quality'] = {
-            'elements_with_coordinates': sum(1 for el in elements if 'lat' in el and 'lon' in el),
-            'elements_with_tags': sum(1 for el in elements if el.get('tags')),
+            'elements_with_coordinates': elements_with_coordinates,
+            'elements_with_tags': elements_with_tags,
             'potential_duplicates': 0,  # Would need more complex logic
             'missing_names': len(elements) - elements_with_names,
             'missing_types': len(elements) - elements_with_types
@@ -2513,15 +2559,16 @@ async def smart_geocode(address_or_description: str) -> Dict[str, Any]:
             if search_result['success'] and search_result['data']['elements']:
                 for element in search_result['data']['elements'][:3]:
                     if 'lat' in element and 'lon' in element:
+                        tags = element.get('tags') or {}
                         results.append({
                             'source': 'osm_search',
                             'confidence': 0.7,
                             'lat': element['lat'],
                             'lon': element['lon'],
-                            'display_name': element.get('tags', {}).get('name', 'Unnamed'),
+                            'display_name': tags.get('name', 'Unnamed'),
                             'osm_type': element['type'],
                             'osm_id': element['id'],
-                            'tags': element.get('tags', {})
+                            'tags': tags
                         })
 
         # Rank results by confidence
@@ -2546,16 +2593,16 @@ async def smart_geocode(address_or_description: str) -> Dict[str, Any]:
             "message": "Failed to geocode address"
         }
 
+POSTAL_CODE_PATTERN = re.compile(r'\b(\d{5}(?:-\d{4})?)\b')
+HOUSE_NUMBER_PATTERN = re.compile(r'^\d+')
+
 def parse_address_components(address: str) -> Dict[str, str]:
     """Parse address into components (street, city, state, country, etc.)."""
     components = {}
     address_lower = address.lower()
 
-    # Basic parsing patterns
-    import re
-
     # Extract postal code
-    postal_match = re.search(r'\b(\d{5}(?:-\d{4})?)\b', address)
+    postal_match = POSTAL_CODE_PATTERN.search(address)
     if postal_match:
         components['postal_code'] = postal_match.group(1)
 
@@ -2568,7 +2615,7 @@ def parse_address_components(address: str) -> Dict[str, str]:
         components['type'] = 'boulevard'
 
     # Extract numbers
-    number_match = re.search(r'^\d+', address)
+    number_match = HOUSE_NUMBER_PATTERN.search(address)
     if number_match:
         components['house_number'] = number_match.group(0)
 
@@ -0,0 +1,32 @@
+"""
+OAuth token file storage
+
+Shared by the MCP server and oauth_auth.py, which may both write the same
+token file at once.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+from typing import Any, Dict
+
+
+def write_token_file(path: str, token_data: Dict[str, Any]) -> None:
+    """Replace a token file atomically, readable only by the owner.
+
+    The data goes to a uniquely named temporary file next to it first, so a
+    crash or a concurrent reader never sees a half-written token, and two
+    concurrent writers never truncate each other's temporary file. mkstemp
+    creates it with mode 0600.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(token_data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
@@ -13,12 +13,13 @@ import os
 import json
 from dotenv import load_dotenv
 
+BANNER_RULE = "=" * 50
+
 def check_setup_status():
     """Quick status check for OSM Edit MCP Server setup"""
     load_dotenv()
 
-    print("🔍 OSM Edit MCP Server - Setup Status Check")
-    print("=" * 50)
+    print(f"🔍 OSM Edit MCP Server - Setup Status Check\n{BANNER_RULE}")
 
     # Check environment file
     if os.path.exists('.env'):
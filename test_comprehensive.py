@@ -6,9 +6,13 @@ Handles authentication status and known API limitations gracefully
 """
 
 import asyncio
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
@@ -30,6 +34,8 @@ from osm_edit_mcp.server import (
     check_authentication, config
 )
 
+BANNER_RULE = "=" * 60
+
 class TestResult:
     """Represents the result of a single test"""
     def __init__(self, tool_name: str, success: bool, message: str,
@@ -52,25 +58,37 @@ class OSMTestSuite:
         
     def setup_logging(self):
         """Setup logging for the test suite"""
+        # Write the log file from a background thread so disk I/O never
+        # blocks the event loop running the tests
+        log_queue = queue.SimpleQueue()
+        file_handler = logging.FileHandler('test_results.log')
+        listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        self.log_listener = listener
+
+        # force=True: importing the server has already configured the root
+        # logger, which would otherwise turn this call into a no-op
         logging.basicConfig(
+            force=True,
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
                 logging.StreamHandler(),
-                logging.FileHandler('test_results.log')
+                logging.handlers.QueueHandler(log_queue)
             ]
         )
         self.logger = logging.getLogger(__name__)
         
     async def run_test(self, test_name: str, test_func, *args, **kwargs) -> TestResult:
         """Run a single test and return result"""
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         
         try:
             self.logger.info(f"Testing {test_name}...")
             result = await test_func(*args, **kwargs)
             
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = time.perf_counter() - start_time
             
             if isinstance(result, dict) and result.get('success'):
                 return TestResult(test_name, True, "Test passed", duration)
@@ -81,7 +99,7 @@ class OSMTestSuite:
                 return TestResult(test_name, True, "Test completed", duration)
                 
         except Exception as e:
-            duration = asyncio.get_event_loop().time() - start_time
+            duration = time.perf_counter() - start_time
             error_msg = f"{type(e).__name__}: {str(e)}"
             self.logger.error(f"Test {test_name} failed: {error_msg}")
             return TestResult(test_name, False, f"Test failed with exception", duration, error_msg)
@@ -268,7 +286,7 @@ class OSMTestSuite:
         self.logger.info(f"API Mode: {'Development' if config.is_development else 'Production'}")
         self.logger.info(f"API Base URL: {config.current_api_base_url}")
         
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         
         # Check authentication first
         await self.test_authentication()
@@ -278,7 +296,7 @@ class OSMTestSuite:
         await self.test_write_operations()
         await self.test_natural_language_operations()
         
-        total_duration = asyncio.get_event_loop().time() - start_time
+        total_duration = time.perf_counter() - start_time
         
         # Generate report
         self.generate_report(total_duration)
@@ -348,9 +366,10 @@ class OSMTestSuite:
 
 async def main():
     """Main test runner"""
-    print("OSM Edit MCP Server - Comprehensive Test Suite")
-    print("Tests all MCP tools with proper error handling")
-    print("=" * 60)
+    print(
+        "OSM Edit MCP Server - Comprehensive Test Suite\n"
+        f"Tests all MCP tools with proper error handling\n{BANNER_RULE}"
+    )
     
     test_suite = OSMTestSuite()
     await test_suite.run_all_tests()
@@ -0,0 +1,132 @@
+"""Test OAuth token refresh in oauth_auth.py."""
+import asyncio
+import importlib
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import dotenv
+import httpx
+import pytest
+
+USER_DETAILS = '<osm><user display_name="mapper" id="42"/></osm>'
+
+
+@pytest.fixture
+def oauth_auth(monkeypatch):
+    """Import oauth_auth without a local .env and with an in-memory keyring."""
+    monkeypatch.setattr(dotenv, "load_dotenv", lambda *args, **kwargs: False)
+    module = importlib.import_module("oauth_auth")
+
+    passwords = {}
+    monkeypatch.setattr(module, "keyring", SimpleNamespace(
+        get_password=lambda service, name: passwords.get((service, name)),
+        set_password=lambda service, name, value: passwords.__setitem__((service, name), value),
+    ))
+    return module
+
+
+class TokenServer:
+    """Mock OSM API that accepts only the access tokens in `valid`."""
+
+    def __init__(self, valid=("new",), refresh_status=200):
+        self.valid = set(valid)
+        self.refresh_status = refresh_status
+        self.refresh_posts = 0
+
+    async def __call__(self, request):
+        if request.method == "POST":
+            self.refresh_posts += 1
+            # Give concurrent callers a chance to pile up behind the lock
+            await asyncio.sleep(0.01)
+            if self.refresh_status != 200:
+                return httpx.Response(self.refresh_status)
+            return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        if token in self.valid:
+            return httpx.Response(200, text=USER_DETAILS)
+        return httpx.Response(401)
+
+
+def make_oauth(module, tmp_path, server, access_token="old", expires_in=-60):
+    """Create an OSMOAuth with a saved token and a mocked HTTP client."""
+    oauth = module.OSMOAuth(use_dev_api=True)
+    oauth.token_file = str(tmp_path / ".osm_token_dev.json")
+    oauth._client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+
+    module.keyring.set_password(oauth.keyring_service, "access_token", access_token)
+    module.keyring.set_password(oauth.keyring_service, "refresh_token", "refresh")
+    expires_at = datetime.now() + timedelta(seconds=expires_in)
+    with open(oauth.token_file, "w") as f:
+        json.dump({"access_token": access_token, "expires_at": expires_at.isoformat()}, f)
+    return oauth
+
+
+def test_concurrent_401s_refresh_once(oauth_auth, tmp_path):
+    """Test that simultaneous rejections share a single refresh."""
+    server = TokenServer()
+
+    async def run():
+        oauth = make_oauth(oauth_auth, tmp_path, server)
+        try:
+            return await asyncio.gather(*(oauth.test_authentication() for _ in range(3)))
+        finally:
+            await oauth.close()
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert server.refresh_posts == 1
+
+
+def test_rejected_token_is_not_handed_back(oauth_auth, tmp_path):
+    """Test that a saved token passed as expired_token triggers a real refresh."""
+    server = TokenServer()
+
+    async def run():
+        # The saved token has plenty of lifetime left but was rejected anyway
+        oauth = make_oauth(oauth_auth, tmp_path, server, expires_in=3600)
+        try:
+            return await oauth.refresh_access_token(expired_token="old")
+        finally:
+            await oauth.close()
+
+    assert asyncio.run(run())["access_token"] == "new"
+    assert server.refresh_posts == 1
+
+
+def test_rejected_refresh_token_is_sent_once(oauth_auth, tmp_path, monkeypatch):
+    """Test that the flow does not retry a refresh token the server just rejected."""
+    server = TokenServer(valid=(), refresh_status=400)
+    monkeypatch.setattr(oauth_auth.webbrowser, "open", lambda url: True)
+
+    def no_input(prompt=""):
+        raise EOFError
+
+    monkeypatch.setattr("builtins.input", no_input)
+
+    async def run():
+        oauth = make_oauth(oauth_auth, tmp_path, server)
+        oauth.client_id = oauth.client_secret = "test"
+        try:
+            with pytest.raises(EOFError):
+                await oauth_auth.run_oauth_flow(oauth)
+        finally:
+            await oauth.close()
+
+    asyncio.run(run())
+    assert server.refresh_posts == 1
+
+
+def test_access_token_cache_cleared_after_401(oauth_auth, tmp_path):
+    """Test that a token the API rejected is not served from memory again."""
+    server = TokenServer(valid=(), refresh_status=400)
+
+    async def run():
+        oauth = make_oauth(oauth_auth, tmp_path, server)
+        try:
+            assert await oauth.test_authentication() is False
+            return oauth._access_token_cache
+        finally:
+            await oauth.close()
+
+    assert asyncio.run(run()) is None
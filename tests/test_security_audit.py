@@ -0,0 +1,88 @@
+"""Test the security audit script."""
+import json
+import subprocess
+
+from scripts import security_audit
+from scripts.security_audit import SecurityAuditor, scan_with_ripgrep
+
+
+def _match_event(path):
+    return {"type": "match", "data": {"path": path, "line_number": 3}}
+
+
+def _fake_ripgrep(monkeypatch, events=(), error=None):
+    """Make scan_with_ripgrep see an rg binary that prints the given --json events."""
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        if error is not None:
+            raise error
+        stdout = "\n".join(json.dumps(event) for event in events)
+        return subprocess.CompletedProcess(args, 0 if events else 1, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(security_audit.shutil, "which", lambda name: "/usr/bin/rg")
+    monkeypatch.setattr(security_audit.subprocess, "run", run)
+    return calls
+
+
+def test_ripgrep_matches_are_parsed(monkeypatch, tmp_path):
+    """Test that the first match per file is returned by path."""
+    path = str(tmp_path / "app.py")
+    events = [
+        {"type": "begin", "data": {"path": {"text": path}}},
+        _match_event({"text": path}),
+        {"type": "end", "data": {"path": {"text": path}}},
+    ]
+    calls = _fake_ripgrep(monkeypatch, events)
+
+    assert scan_with_ripgrep(tmp_path, SecurityAuditor.SKIP_DIRS) == {tmp_path / "app.py": 3}
+    assert calls[0][-1] == str(tmp_path)
+    assert "*.py" in calls[0] and "--type" not in calls[0]
+
+
+def test_ripgrep_without_matches(monkeypatch, tmp_path):
+    """Test that exit status 1 (no match) is an empty result, not a failure."""
+    _fake_ripgrep(monkeypatch)
+    assert scan_with_ripgrep(tmp_path, SecurityAuditor.SKIP_DIRS) == {}
+
+
+def test_ripgrep_non_utf8_path_falls_back(monkeypatch, tmp_path):
+    """Test that a path reported as bytes makes the caller use the Python scan."""
+    _fake_ripgrep(monkeypatch, [_match_event({"bytes": "/w=="})])
+    assert scan_with_ripgrep(tmp_path, SecurityAuditor.SKIP_DIRS) is None
+
+
+def test_ripgrep_os_error_falls_back(monkeypatch, tmp_path):
+    """Test that failing to start rg (e.g. E2BIG) makes the caller use the Python scan."""
+    _fake_ripgrep(monkeypatch, error=OSError(7, "Argument list too long"))
+    assert scan_with_ripgrep(tmp_path, SecurityAuditor.SKIP_DIRS) is None
+
+
+def test_source_files_filtered_relative_to_root(tmp_path):
+    """Test that only directories below the root are checked for test/venv."""
+    root = tmp_path / "latest" / "checkout"
+    for relative in ("app.py", "stubs.pyi", "tests/test_app.py", "pkg/venv_tools/x.py", "pkg/mod.py"):
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_text("")
+
+    found = {p.relative_to(root).as_posix() for p in SecurityAuditor(root).iter_source_files()}
+    assert found == {"app.py", "pkg/mod.py"}
+
+
+def test_gitignore_entries_are_normalized(tmp_path):
+    """Test that anchored and directory-style .gitignore entries are recognised."""
+    (tmp_path / ".gitignore").write_text(
+        "# secrets\n/.env\n**/*.key\n*.pem/\n*.p12\n/.osm_token_*.json\noauth_tokens.json\n"
+    )
+    auditor = SecurityAuditor(tmp_path)
+    auditor.check_sensitive_files()
+    assert auditor.issues == []
+
+
+def test_missing_gitignore_pattern_is_reported(tmp_path):
+    """Test that a sensitive pattern absent from .gitignore is still reported."""
+    (tmp_path / ".gitignore").write_text("/.envrc\n*.key\n*.pem\n*.p12\n.osm_token_*.json\noauth_tokens.json\n")
+    auditor = SecurityAuditor(tmp_path)
+    auditor.check_sensitive_files()
+    assert [issue["description"] for issue in auditor.issues] == ["Pattern '.env' not found in .gitignore"]
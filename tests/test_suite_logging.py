@@ -0,0 +1,24 @@
+"""Test the comprehensive test suite's log file setup."""
+import atexit
+import logging
+
+import test_comprehensive
+
+
+def test_logged_record_reaches_results_file(tmp_path, monkeypatch):
+    """Test that suite log records are written to test_results.log."""
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        suite = test_comprehensive.OSMTestSuite()
+        suite.logger.info("queued record")
+        suite.log_listener.stop()
+        atexit.unregister(suite.log_listener.stop)
+    finally:
+        for handler in root.handlers:
+            handler.close()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    assert "queued record" in (tmp_path / "test_results.log").read_text()
@@ -0,0 +1,32 @@
+"""Test the natural language tag mapping tables."""
+import ast
+from pathlib import Path
+
+SERVER_SOURCE = Path(__file__).parent.parent / "src" / "osm_edit_mcp" / "server.py"
+
+
+def _table_keys(name):
+    """Return the literal keys of a module-level dict in server.py, in order.
+
+    A dict literal silently keeps only the last of two equal keys, so the
+    source has to be inspected to see duplicates.
+    """
+    tree = ast.parse(SERVER_SOURCE.read_text())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == name for target in node.targets
+        ):
+            return [ast.literal_eval(key) for key in node.value.keys]
+    raise AssertionError(f"{name} not found in server.py")
+
+
+def test_business_types_have_no_duplicate_phrases():
+    """Test that no business type phrase is defined twice."""
+    keys = _table_keys("BUSINESS_TYPES")
+    assert len(keys) == len(set(keys))
+
+
+def test_feature_mappings_have_no_duplicate_phrases():
+    """Test that no feature phrase is defined twice."""
+    keys = _table_keys("FEATURE_MAPPINGS")
+    assert len(keys) == len(set(keys))
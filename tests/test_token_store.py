@@ -0,0 +1,31 @@
+"""Test OAuth token file storage."""
+import json
+import os
+import stat
+
+from src.osm_edit_mcp.token_store import write_token_file
+
+
+def test_write_token_file(tmp_path):
+    """Test that the token file is replaced, private, and leaves no temp file."""
+    token_file = tmp_path / ".osm_token_dev.json"
+    token_file.write_text('{"access_token": "old"}')
+
+    write_token_file(str(token_file), {"access_token": "new"})
+
+    assert json.loads(token_file.read_text()) == {"access_token": "new"}
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".osm_token_dev.json"]
+
+
+def test_write_token_file_ignores_stale_temp_file(tmp_path):
+    """Test that a temp file left by a crashed writer is neither reused nor needed."""
+    token_file = tmp_path / ".osm_token_dev.json"
+    stale = tmp_path / ".osm_token_dev.json.tmp"
+    stale.write_text("partial")
+    stale.chmod(0o644)
+
+    write_token_file(str(token_file), {"access_token": "new"})
+
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+    assert stale.read_text() == "partial"
@@ -32,6 +32,7 @@ from osm_edit_mcp.server import (
     create_osm_node,
     create_place_from_description,
     parse_natural_language_osm_request,
+    close_shared_http_client,
     config
 )
 
@@ -59,6 +60,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"API Base URL: {config.current_api_base_url}")
     yield
     logger.info("Shutting down OSM Edit Web API")
+    await close_shared_http_client()
 
 # Create FastAPI app
 app = FastAPI(